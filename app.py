@@ -1,106 +1,293 @@
 import os
+# One BLAS/OpenMP thread per process; gunicorn provides the parallelism
+os.environ.setdefault('OMP_NUM_THREADS', '1')
 import re
 import json
-from flask import Flask, request, jsonify, render_template_string
-from werkzeug.utils import secure_filename
-import PyPDF2
+import bisect
+import hashlib
+import importlib.util
+import threading
+from collections import OrderedDict
+from flask import Flask, request
+import orjson
+import pypdfium2 as pdfium
 import docx
 import numpy as np
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import warnings
 warnings.filterwarnings('ignore')
 
-# Try to import sentence transformers (for semantic matching)
+# Check for the optional semantic matching libraries without importing them;
+# the heavy imports happen in _load_semantic_model on first use
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
+
+# ONNX Runtime support (for faster int8-quantized semantic matching)
+ONNX_AVAILABLE = all(importlib.util.find_spec(name) is not None
+                     for name in ('optimum', 'onnxruntime', 'transformers'))
+
+# Try to import Aho-Corasick (for single-pass section header search)
 try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-    TRANSFORMERS_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    print("Sentence transformers not available. Using keyword matching only.")
+    AHOCORASICK_AVAILABLE = False
 
-# Download required NLTK data
+# Download NLTK stopwords only if they are not installed yet
 try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except:
-    pass
+    nltk.data.find('corpora/stopwords')
+except LookupError:
+    try:
+        nltk.download('stopwords', quiet=True)
+    except:
+        pass
+
+# Stopword sets built once at import
+try:
+    _STOPWORDS = frozenset(stopwords.words('english'))
+except LookupError:
+    _STOPWORDS = frozenset()
+_COMMON_STOPS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
+SEMANTIC_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR', 'onnx_model')
+
+# Number of sentence embeddings kept in memory for repeated JD/skill strings
+EMBEDDING_CACHE_SIZE = 4096
+# Texts shorter than this are scored 0 without running the model
+MIN_SEMANTIC_TEXT_LENGTH = 3
+# Skills keyword scores at 0 or at/above this settle the match without the model
+DECISIVE_KEYWORD_SCORE = 95.0
+# Normalized embeddings are stored as int8, scaled so that 1.0 maps to 127
+EMBEDDING_SCALE = 127
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.config['UPLOAD_FOLDER'] = 'uploads'
 
-# Create uploads directory if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+def ojsonify(obj, status=200):
+    """JSON response serialized with orjson instead of the stdlib encoder"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
 
-# Load semantic model (using a lightweight model for local execution)
-if TRANSFORMERS_AVAILABLE:
-    try:
-        semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
-        SEMANTIC_MATCHING = True
-        print("Semantic matching enabled with sentence-transformers")
-    except Exception as e:
-        semantic_model = None
-        SEMANTIC_MATCHING = False
-        print(f"Could not load semantic model: {e}")
-else:
-    semantic_model = None
-    SEMANTIC_MATCHING = False
+class OnnxSentenceEncoder:
+    """Int8-quantized ONNX Runtime drop-in for SentenceTransformer.encode"""
+    QUANTIZED_FILE = 'model_quantized.onnx'
+    
+    def __init__(self, model_dir):
+        # The model is exported offline by export_onnx_model.py; never export while serving
+        model_path = os.path.join(model_dir, self.QUANTIZED_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"{model_path} not found, run export_onnx_model.py first")
+        
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        
+        # One intra-op thread per process; OMP_NUM_THREADS doesn't reach ORT's own pool
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = 1
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(model_dir, file_name=self.QUANTIZED_FILE,
+                                                                  session_options=session_options)
+    
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, normalize_embeddings=False):
+        """Mean-pooled sentence embeddings as a numpy array"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            inputs = self.tokenizer(sentences[start:start + batch_size], padding=True,
+                                    truncation=True, max_length=256, return_tensors='np')
+            token_embeddings = self.model(**inputs).last_hidden_state
+            
+            # Mean pooling over non-padding tokens
+            mask = inputs['attention_mask'][..., None].astype(token_embeddings.dtype)
+            summed = (token_embeddings * mask).sum(axis=1)
+            batches.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+        
+        embeddings = np.concatenate(batches)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        
+        return embeddings[0] if single else embeddings
+
+# The ONNX path only serves a model already exported by export_onnx_model.py
+ONNX_MODEL_EXPORTED = ONNX_AVAILABLE and os.path.exists(
+    os.path.join(ONNX_MODEL_DIR, OnnxSentenceEncoder.QUANTIZED_FILE))
+
+# Semantic model is loaded lazily on first use, so idle workers and keyword-only
+# requests don't pay for it. SEMANTIC_MATCHING means a model can be loaded and
+# is cleared if loading fails.
+SEMANTIC_MATCHING = ONNX_MODEL_EXPORTED or TRANSFORMERS_AVAILABLE
+_semantic_model = None
+_semantic_model_loaded = False
+_semantic_lock = threading.Lock()
+if not SEMANTIC_MATCHING:
+    print("Sentence transformers not available. Using keyword matching only.")
     print("Semantic matching disabled - using keyword matching only")
 
+def _load_semantic_model():
+    """Load the ONNX model, falling back to sentence-transformers"""
+    # Avoid torch thread oversubscription across gunicorn workers
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    
+    model = None
+    if ONNX_MODEL_EXPORTED:
+        try:
+            model = OnnxSentenceEncoder(ONNX_MODEL_DIR)
+            print("Semantic matching enabled with int8-quantized ONNX Runtime")
+        except Exception as e:
+            print(f"Could not load ONNX model, falling back to sentence-transformers: {e}")
+    
+    if model is None and TRANSFORMERS_AVAILABLE:
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(SEMANTIC_MODEL_NAME)
+            print("Semantic matching enabled with sentence-transformers")
+        except Exception as e:
+            print(f"Could not load semantic model: {e}")
+    
+    # Warm up the model so the first match doesn't pay for lazy initialization
+    if model is not None:
+        try:
+            model.encode(["warmup text"])
+        except Exception as e:
+            print(f"Semantic model warmup failed: {e}")
+    
+    return model
+
+def _get_model():
+    """Return the shared semantic model, loading it on first call"""
+    global _semantic_model, _semantic_model_loaded, SEMANTIC_MATCHING
+    if not _semantic_model_loaded:
+        with _semantic_lock:
+            if not _semantic_model_loaded:
+                _semantic_model = _load_semantic_model()
+                if _semantic_model is None:
+                    SEMANTIC_MATCHING = False
+                _semantic_model_loaded = True
+    return _semantic_model
+
+# Regex patterns compiled once at import instead of on every request
+_RE_NAME_LINE = re.compile(r'^[A-Za-z\s\.]+$')
+_RE_NAME_FIELD = re.compile(r'Name\s*:\s*(.+)', re.IGNORECASE)
+_RE_BULLET = re.compile(r'^[\-\•\*\+\s]+')
+_RE_JOB_TITLE = re.compile(r'(role|position|title)\s*:\s*(.+)', re.IGNORECASE)
+_RE_EXP_REQUIREMENTS = [
+    re.compile(r'(\d+)\+?\s*years?\s*(of\s*)?experience', re.IGNORECASE),
+    re.compile(r'experience\s*:\s*(.+)', re.IGNORECASE),
+    re.compile(r'minimum\s*(\d+)\s*years?', re.IGNORECASE)
+]
+_RE_SKILLS_SECTION = re.compile(r'(skills|required|tools|technologies)\s*:(.+?)(?=\n\n|\n[A-Z]|$)',
+                                re.IGNORECASE | re.DOTALL)
+_RE_SKILL_SEPARATORS = re.compile(r'[,;\n\-\•\*]+')
+_RE_EDU_REQUIREMENTS = [
+    re.compile(r'(bachelor|master|phd|degree)\s*.*?(in\s*.+?)(?=[,\n\.]|$)', re.IGNORECASE),
+    re.compile(r'education\s*:\s*(.+)', re.IGNORECASE)
+]
+_RE_WORDS = re.compile(r'\w+')
+_RE_YEARS = re.compile(r'(\d+)\s*years?', re.IGNORECASE)
+_RE_DIGIT = re.compile(r'\d+')
+
+# Resume section headers and the headers that end each section
+SECTION_KEYWORDS = {
+    'experience': ['experience', 'work experience', 'employment', 'work history'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'expertise'],
+    'education': ['education', 'academic background', 'qualifications']
+}
+SECTION_END_KEYWORDS = {
+    'experience': ['education', 'skills', 'projects', 'achievements'],
+    'skills': ['experience', 'education', 'projects', 'achievements'],
+    'education': ['experience', 'skills', 'projects', 'achievements']
+}
+_SECTION_HEADERS = sorted({keyword
+                           for keywords in list(SECTION_KEYWORDS.values()) + list(SECTION_END_KEYWORDS.values())
+                           for keyword in keywords})
+
+if AHOCORASICK_AVAILABLE:
+    _SECTION_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _SECTION_HEADERS:
+        _SECTION_AUTOMATON.add_word(_keyword, _keyword)
+    _SECTION_AUTOMATON.make_automaton()
+
+def _tokens(items):
+    """Lowercased keyword set of a list of strings, without common stop words"""
+    text = ' '.join(items).lower()
+    return {word for word in _RE_WORDS.findall(text) if word not in _COMMON_STOPS}
+
 class ResumeParser:
     def __init__(self):
-        self.stop_words = set(stopwords.words('english')) if nltk.data.find('corpora/stopwords') else set()
+        self.stop_words = _STOPWORDS
     
-    def extract_text_from_pdf(self, file_path):
-        """Extract text from PDF file"""
+    def extract_text_from_pdf(self, stream):
+        """Extract text from a PDF file object"""
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-                return text
+            pdf = pdfium.PdfDocument(stream.read())
+            try:
+                return "".join([page.get_textpage().get_text_range() or "" for page in pdf])
+            finally:
+                pdf.close()
         except Exception as e:
             print(f"Error reading PDF: {e}")
             return ""
     
-    def extract_text_from_docx(self, file_path):
-        """Extract text from DOCX file"""
+    def extract_text_from_docx(self, stream):
+        """Extract text from a DOCX file object"""
         try:
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            doc = docx.Document(stream)
+            return "\n".join(paragraph.text for paragraph in doc.paragraphs)
         except Exception as e:
             print(f"Error reading DOCX: {e}")
             return ""
     
-    def extract_text_from_txt(self, file_path):
-        """Extract text from TXT file"""
+    def extract_text_from_txt(self, stream):
+        """Extract text from a TXT file object"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            text = stream.read().decode('utf-8', errors='replace')
+            # Universal newlines, as text-mode open() would give
+            return text.replace('\r\n', '\n').replace('\r', '\n')
         except Exception as e:
             print(f"Error reading TXT: {e}")
             return ""
     
+    def extract_text_from_stream(self, stream, filename):
+        """Extract text from a binary file object based on the filename's extension"""
+        extractor = self._extractor_for(filename)
+        return extractor(stream) if extractor else ""
+    
     def extract_text_from_file(self, file_path):
         """Extract text based on file extension"""
-        _, ext = os.path.splitext(file_path)
+        extractor = self._extractor_for(file_path)
+        if not extractor:
+            return ""
+        
+        try:
+            with open(file_path, 'rb') as file:
+                return extractor(file)
+        except Exception as e:
+            print(f"Error opening file: {e}")
+            return ""
+    
+    def _extractor_for(self, filename):
+        """Extractor method for the filename's extension, or None if unsupported"""
+        _, ext = os.path.splitext(filename)
         ext = ext.lower()
         
         if ext == '.pdf':
-            return self.extract_text_from_pdf(file_path)
+            return self.extract_text_from_pdf
         elif ext == '.docx':
-            return self.extract_text_from_docx(file_path)
+            return self.extract_text_from_docx
         elif ext == '.txt':
-            return self.extract_text_from_txt(file_path)
+            return self.extract_text_from_txt
         else:
-            return ""
+            return None
     
     def extract_name(self, text):
         """Extract candidate name from resume text"""
@@ -110,27 +297,48 @@ class ResumeParser:
             line = line.strip()
             if line and not any(keyword in line.lower() for keyword in ['email', 'phone', 'address', 'linkedin']):
                 # Check if line looks like a name (contains letters and possibly spaces)
-                if re.match(r'^[A-Za-z\s\.]+$', line) and len(line.split()) <= 4:
+                if _RE_NAME_LINE.match(line) and len(line.split()) <= 4:
                     return line.strip()
         
         # Fallback: look for "Name:" pattern
-        name_match = re.search(r'Name\s*:\s*(.+)', text, re.IGNORECASE)
+        name_match = _RE_NAME_FIELD.search(text)
         if name_match:
             return name_match.group(1).strip()
         
         return "Unknown Candidate"
     
-    def extract_section(self, text, section_keywords, end_keywords=None):
+    def locate_section_headers(self, text_lower, keywords=None):
+        """Map section keywords to the sorted positions where they occur"""
+        if keywords is None and AHOCORASICK_AVAILABLE:
+            # Single linear pass over the text for every known header
+            headers = {keyword: [] for keyword in _SECTION_HEADERS}
+            for end_index, keyword in _SECTION_AUTOMATON.iter(text_lower):
+                headers[keyword].append(end_index - len(keyword) + 1)
+            return headers
+        
+        headers = {}
+        for keyword in (keywords or _SECTION_HEADERS):
+            keyword = keyword.lower()
+            positions = []
+            pos = text_lower.find(keyword)
+            while pos != -1:
+                positions.append(pos)
+                pos = text_lower.find(keyword, pos + 1)
+            headers[keyword] = positions
+        return headers
+    
+    def extract_section(self, text, text_lower, section_keywords, end_keywords=None, headers=None):
         """Extract content from a specific section"""
-        text_lower = text.lower()
+        if headers is None:
+            headers = self.locate_section_headers(text_lower, section_keywords + (end_keywords or []))
         section_content = []
         
         # Find section start
         start_pos = -1
         for keyword in section_keywords:
-            pos = text_lower.find(keyword.lower())
-            if pos != -1 and (start_pos == -1 or pos < start_pos):
-                start_pos = pos
+            positions = headers.get(keyword.lower())
+            if positions and (start_pos == -1 or positions[0] < start_pos):
+                start_pos = positions[0]
         
         if start_pos == -1:
             return []
@@ -139,9 +347,10 @@ class ResumeParser:
         end_pos = len(text)
         if end_keywords:
             for keyword in end_keywords:
-                pos = text_lower.find(keyword.lower(), start_pos + 1)
-                if pos != -1 and pos < end_pos:
-                    end_pos = pos
+                positions = headers.get(keyword.lower(), [])
+                index = bisect.bisect_left(positions, start_pos + 1)
+                if index < len(positions) and positions[index] < end_pos:
+                    end_pos = positions[index]
         
         section_text = text[start_pos:end_pos]
         
@@ -151,7 +360,7 @@ class ResumeParser:
             line = line.strip()
             if line and not any(kw in line.lower() for kw in section_keywords + (end_keywords or [])):
                 # Remove bullet points and clean
-                line = re.sub(r'^[\-\•\*\+\s]+', '', line)
+                line = _RE_BULLET.sub('', line)
                 if line:
                     section_content.append(line)
         
@@ -166,26 +375,30 @@ class ResumeParser:
             'education': []
         }
         
-        # Extract experience
-        exp_keywords = ['experience', 'work experience', 'employment', 'work history']
-        exp_end_keywords = ['education', 'skills', 'projects', 'achievements']
-        result['experience'] = self.extract_section(text, exp_keywords, exp_end_keywords)
-        
-        # Extract skills
-        skill_keywords = ['skills', 'technical skills', 'core competencies', 'expertise']
-        skill_end_keywords = ['experience', 'education', 'projects', 'achievements']
-        result['skills'] = self.extract_section(text, skill_keywords, skill_end_keywords)
+        # Lowercase once and locate every section header in one pass
+        text_lower = text.lower()
+        headers = self.locate_section_headers(text_lower)
         
-        # Extract education
-        edu_keywords = ['education', 'academic background', 'qualifications']
-        edu_end_keywords = ['experience', 'skills', 'projects', 'achievements']
-        result['education'] = self.extract_section(text, edu_keywords, edu_end_keywords)
+        # Sequential on purpose: extraction is GIL-bound Python loops, so threads only add overhead
+        for section in ('experience', 'skills', 'education'):
+            result[section] = self.extract_section(text, text_lower, SECTION_KEYWORDS[section],
+                                                   SECTION_END_KEYWORDS[section], headers)
         
         return result
 
 class JobMatcher:
-    def __init__(self, semantic_model=None):
-        self.semantic_model = semantic_model
+    def __init__(self, semantic_model=None, cache_size=EMBEDDING_CACHE_SIZE):
+        self._semantic_model = semantic_model
+        self.cache_size = cache_size
+        self._embedding_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @property
+    def semantic_model(self):
+        """Explicitly provided model, or the lazily loaded shared one"""
+        if self._semantic_model is not None:
+            return self._semantic_model
+        return _get_model()
     
     def extract_job_requirements(self, jd_text):
         """Extract requirements from job description"""
@@ -197,41 +410,29 @@ class JobMatcher:
         }
         
         # Extract job title
-        title_match = re.search(r'(role|position|title)\s*:\s*(.+)', jd_text, re.IGNORECASE)
+        title_match = _RE_JOB_TITLE.search(jd_text)
         if title_match:
             result['title'] = title_match.group(2).strip()
         
         # Extract experience requirements
-        exp_patterns = [
-            r'(\d+)\+?\s*years?\s*(of\s*)?experience',
-            r'experience\s*:\s*(.+)',
-            r'minimum\s*(\d+)\s*years?'
-        ]
-        
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, jd_text, re.IGNORECASE)
+        for pattern in _RE_EXP_REQUIREMENTS:
+            matches = pattern.findall(jd_text)
             for match in matches:
                 if isinstance(match, tuple):
                     match = ' '.join(str(m) for m in match if m)
                 result['required_experience'].append(match.strip())
         
         # Extract skills and tools
-        skills_section = re.search(r'(skills|required|tools|technologies)\s*:(.+?)(?=\n\n|\n[A-Z]|$)', 
-                                 jd_text, re.IGNORECASE | re.DOTALL)
+        skills_section = _RE_SKILLS_SECTION.search(jd_text)
         if skills_section:
             skills_text = skills_section.group(2)
             # Split by common separators
-            skills = re.split(r'[,;\n\-\•\*]+', skills_text)
+            skills = _RE_SKILL_SEPARATORS.split(skills_text)
             result['required_skills'] = [skill.strip() for skill in skills if skill.strip()]
         
         # Extract education requirements
-        edu_patterns = [
-            r'(bachelor|master|phd|degree)\s*.*?(in\s*.+?)(?=[,\n\.]|$)',
-            r'education\s*:\s*(.+)'
-        ]
-        
-        for pattern in edu_patterns:
-            matches = re.findall(pattern, jd_text, re.IGNORECASE)
+        for pattern in _RE_EDU_REQUIREMENTS:
+            matches = pattern.findall(jd_text)
             for match in matches:
                 if isinstance(match, tuple):
                     match = ' '.join(str(m) for m in match if m)
@@ -239,9 +440,85 @@ class JobMatcher:
         
         return result
     
-    def semantic_similarity(self, text1_list, text2_list):
+    def encode_texts(self, texts):
+        """Embed a list of texts, batching cache misses into a single model call"""
+        unique_texts = list(dict.fromkeys(text for text in texts if text))
+        if not unique_texts:
+            return {}
+        
+        result = {}
+        missing = []
+        with self._cache_lock:
+            for text in unique_texts:
+                key = self._cache_key(text)
+                if key in self._embedding_cache:
+                    self._embedding_cache.move_to_end(key)
+                    result[text] = self._embedding_cache[key]
+                else:
+                    missing.append(text)
+        
+        if missing:
+            embeddings = self.semantic_model.encode(missing, batch_size=8, convert_to_numpy=True,
+                                                    normalize_embeddings=True)
+            embeddings = self._quantize(embeddings)
+            with self._cache_lock:
+                for text, embedding in zip(missing, embeddings):
+                    result[text] = embedding
+                    self._embedding_cache[self._cache_key(text)] = embedding
+                while len(self._embedding_cache) > self.cache_size:
+                    self._embedding_cache.popitem(last=False)
+        
+        return result
+    
+    @staticmethod
+    def _quantize(embeddings):
+        """Quantize L2-normalized float embeddings to int8"""
+        return np.round(np.asarray(embeddings) * EMBEDDING_SCALE).astype(np.int8)
+    
+    @staticmethod
+    def _cache_key(text):
+        """Fixed-size cache key so long texts are not held in memory"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def precompute_embeddings(self, parsed_resume, job_requirements, skills_keyword_score=None):
+        """Embed every text compared during a match in one forward pass"""
+        if not SEMANTIC_MATCHING:
+            return {}
+        
+        pairs = [(parsed_resume['education'], job_requirements['required_education'])]
+        
+        # Skills only need embeddings when the keyword score doesn't settle the match
+        if skills_keyword_score is None:
+            skills_keyword_score = self.keyword_similarity(parsed_resume['skills'], job_requirements['required_skills'])
+        if not self._is_decisive_keyword_score(skills_keyword_score):
+            pairs.append((parsed_resume['skills'], job_requirements['required_skills']))
+        
+        texts = []
+        for resume_items, required_items in pairs:
+            resume_text = ' '.join(resume_items)
+            required_text = ' '.join(required_items)
+            if len(resume_text) >= MIN_SEMANTIC_TEXT_LENGTH and len(required_text) >= MIN_SEMANTIC_TEXT_LENGTH:
+                texts.append(resume_text)
+                texts.append(required_text)
+        
+        # Only load the model once there is something to embed
+        if not texts or not self.semantic_model:
+            return {}
+        
+        try:
+            return self.encode_texts(texts)
+        except Exception as e:
+            print(f"Embedding calculation failed: {e}")
+            return {}
+    
+    @staticmethod
+    def _is_decisive_keyword_score(score):
+        """Whether a skills keyword score is clear-cut enough to skip semantic matching"""
+        return score == 0.0 or score >= DECISIVE_KEYWORD_SCORE
+    
+    def semantic_similarity(self, text1_list, text2_list, embeddings=None):
         """Calculate semantic similarity between two text lists"""
-        if not TRANSFORMERS_AVAILABLE or not self.semantic_model or not text1_list or not text2_list:
+        if not text1_list or not text2_list:
             return 0.0
         
         try:
@@ -249,13 +526,21 @@ class JobMatcher:
             text1 = ' '.join(text1_list)
             text2 = ' '.join(text2_list)
             
-            # Get embeddings
-            embeddings1 = self.semantic_model.encode([text1])
-            embeddings2 = self.semantic_model.encode([text2])
+            # Skip the model entirely for trivially small inputs
+            if len(text1) < MIN_SEMANTIC_TEXT_LENGTH or len(text2) < MIN_SEMANTIC_TEXT_LENGTH:
+                return 0.0
+            
+            if not self.semantic_model:
+                return 0.0
+            
+            # Use precomputed embeddings, encoding both texts together if missing
+            if not embeddings or text1 not in embeddings or text2 not in embeddings:
+                embeddings = self.encode_texts([text1, text2])
             
-            # Calculate cosine similarity
-            similarity = cosine_similarity(embeddings1, embeddings2)[0][0]
-            return max(0, similarity * 100)  # Convert to percentage
+            # Embeddings are L2-normalized int8, so cosine similarity is a scaled integer dot product
+            dot = np.dot(embeddings[text1].astype(np.int32), embeddings[text2].astype(np.int32))
+            similarity = float(dot) / (EMBEDDING_SCALE * EMBEDDING_SCALE)
+            return min(100.0, max(0.0, similarity * 100))  # Convert to percentage, clamped against int8 rounding
         except Exception as e:
             print(f"Semantic similarity calculation failed: {e}")
             return 0.0
@@ -265,26 +550,14 @@ class JobMatcher:
         if not resume_items or not required_items:
             return 0.0
         
-        resume_text = ' '.join(resume_items).lower()
-        required_text = ' '.join(required_items).lower()
-        
-        # Extract keywords (remove common words)
-        resume_words = set(re.findall(r'\w+', resume_text))
-        required_words = set(re.findall(r'\w+', required_text))
-        
-        # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        resume_words -= stop_words
-        required_words -= stop_words
-        
+        resume_words = _tokens(resume_items)
+        required_words = _tokens(required_items)
         if not required_words:
             return 0.0
         
         # Calculate overlap
-        overlap = len(resume_words.intersection(required_words))
-        similarity = (overlap / len(required_words)) * 100
-        
-        return min(100, similarity)
+        overlap = len(resume_words & required_words)
+        return min(100.0, 100.0 * overlap / len(required_words))
     
     def calculate_experience_match(self, resume_exp, required_exp):
         """Calculate experience match score"""
@@ -292,19 +565,14 @@ class JobMatcher:
             return 0.0
         
         # Extract years from resume
-        resume_years = []
-        for exp in resume_exp:
-            year_matches = re.findall(r'(\d+)\s*years?', exp, re.IGNORECASE)
-            resume_years.extend([int(y) for y in year_matches])
+        total_resume_years = sum(int(m.group(1)) for exp in resume_exp for m in _RE_YEARS.finditer(exp))
         
-        total_resume_years = sum(resume_years) if resume_years else 0
-        
-        # Extract required years
+        # Extract required years (first number in each requirement)
         required_years = 0
         for req in required_exp:
-            year_matches = re.findall(r'(\d+)', str(req))
-            if year_matches:
-                required_years = max(required_years, int(year_matches[0]))
+            year_match = _RE_DIGIT.search(str(req))
+            if year_match:
+                required_years = max(required_years, int(year_match.group()))
         
         if required_years == 0:
             return 50.0  # Default score if no specific requirement
@@ -315,20 +583,21 @@ class JobMatcher:
         else:
             return (total_resume_years / required_years) * 70
     
-    def calculate_skills_match(self, resume_skills, required_skills):
+    def calculate_skills_match(self, resume_skills, required_skills, embeddings=None, keyword_score=None):
         """Calculate skills match score"""
         if not resume_skills or not required_skills:
             return 0.0
         
-        # Use semantic matching if available, otherwise use keyword matching
-        if SEMANTIC_MATCHING:
-            semantic_score = self.semantic_similarity(resume_skills, required_skills)
+        # Cheap keyword score first; no overlap or a near-perfect one needs no semantic refinement
+        if keyword_score is None:
             keyword_score = self.keyword_similarity(resume_skills, required_skills)
-            return (semantic_score * 0.7 + keyword_score * 0.3)
-        else:
-            return self.keyword_similarity(resume_skills, required_skills)
+        if not SEMANTIC_MATCHING or self._is_decisive_keyword_score(keyword_score):
+            return keyword_score
+        
+        semantic_score = self.semantic_similarity(resume_skills, required_skills, embeddings)
+        return (semantic_score * 0.7 + keyword_score * 0.3)
     
-    def calculate_education_match(self, resume_education, required_education):
+    def calculate_education_match(self, resume_education, required_education, embeddings=None):
         """Calculate education match score"""
         if not resume_education:
             return 0.0
@@ -338,7 +607,7 @@ class JobMatcher:
         
         # Use semantic matching if available, otherwise use keyword matching
         if SEMANTIC_MATCHING:
-            semantic_score = self.semantic_similarity(resume_education, required_education)
+            semantic_score = self.semantic_similarity(resume_education, required_education, embeddings)
             keyword_score = self.keyword_similarity(resume_education, required_education)
             return (semantic_score * 0.6 + keyword_score * 0.4)
         else:
@@ -360,12 +629,10 @@ class JobMatcher:
 
 # Initialize components
 resume_parser = ResumeParser()
-job_matcher = JobMatcher(semantic_model)
+job_matcher = JobMatcher()
 
-@app.route('/')
-def index():
-    """Main page with upload form"""
-    html_template = '''
+# HTML templates for the web interface
+INDEX_HTML = '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -421,96 +688,8 @@ def index():
     </body>
     </html>
     '''
-    return render_template_string(html_template, semantic_matching=SEMANTIC_MATCHING)
-
-@app.route('/match', methods=['POST'])
-def match_resume():
-    """Main matching endpoint"""
-    try:
-        # Check if resume file is provided
-        if 'resume' not in request.files:
-            return jsonify({'error': 'No resume file provided'}), 400
-        
-        file = request.files['resume']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        # Get job description
-        job_description = request.form.get('job_description', '').strip()
-        if not job_description:
-            return jsonify({'error': 'Job description is required'}), 400
-        
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-        
-        try:
-            # Extract text from resume
-            resume_text = resume_parser.extract_text_from_file(file_path)
-            if not resume_text.strip():
-                return jsonify({'error': 'Could not extract text from resume file'}), 400
-            
-            # Parse resume
-            parsed_resume = resume_parser.parse_resume(resume_text)
-            
-            # Parse job description
-            job_requirements = job_matcher.extract_job_requirements(job_description)
-            
-            # Calculate match scores
-            exp_score = job_matcher.calculate_experience_match(
-                parsed_resume['experience'], 
-                job_requirements['required_experience']
-            )
-            
-            skills_score = job_matcher.calculate_skills_match(
-                parsed_resume['skills'], 
-                job_requirements['required_skills']
-            )
-            
-            edu_score = job_matcher.calculate_education_match(
-                parsed_resume['education'], 
-                job_requirements['required_education']
-            )
-            
-            overall_score = job_matcher.calculate_overall_score(exp_score, skills_score, edu_score)
-            
-            # Prepare response
-            result = {
-                'candidate_name': parsed_resume['name'],
-                'job_title': job_requirements['title'],
-                'match_scores': {
-                    'experience_match': int(exp_score),
-                    'skills_match': int(skills_score),
-                    'education_match': int(edu_score),
-                    'overall_score': int(overall_score)
-                },
-                'details': {
-                    'parsed_resume': parsed_resume,
-                    'job_requirements': job_requirements,
-                    'semantic_matching_used': SEMANTIC_MATCHING
-                }
-            }
-            
-            # Return JSON if requested via API, otherwise render HTML
-            if request.headers.get('Content-Type') == 'application/json' or 'application/json' in request.headers.get('Accept', ''):
-                return jsonify(result)
-            else:
-                return render_result_page(result)
-        
-        finally:
-            # Clean up uploaded file
-            try:
-                os.remove(file_path)
-            except:
-                pass
-    
-    except Exception as e:
-        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
-def render_result_page(result):
-    """Render results page with detailed breakdown"""
-    html_template = '''
+RESULT_HTML = '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -613,20 +792,118 @@ def render_result_page(result):
     </body>
     </html>
     '''
-    return render_template_string(html_template, result=result)
+
+# Compile both templates once instead of re-parsing them on every request
+INDEX_TEMPLATE = app.jinja_env.from_string(INDEX_HTML)
+RESULT_TEMPLATE = app.jinja_env.from_string(RESULT_HTML)
+
+@app.route('/')
+def index():
+    """Main page with upload form"""
+    return INDEX_TEMPLATE.render(semantic_matching=SEMANTIC_MATCHING)
+
+@app.route('/match', methods=['POST'])
+def match_resume():
+    """Main matching endpoint"""
+    try:
+        # Check if resume file is provided
+        if 'resume' not in request.files:
+            return ojsonify({'error': 'No resume file provided'}, 400)
+        
+        file = request.files['resume']
+        if file.filename == '':
+            return ojsonify({'error': 'No file selected'}, 400)
+        
+        # Get job description
+        job_description = request.form.get('job_description', '').strip()
+        if not job_description:
+            return ojsonify({'error': 'Job description is required'}, 400)
+        
+        # Extract text from resume in memory, without a disk round-trip
+        resume_text = resume_parser.extract_text_from_stream(file.stream, file.filename)
+        if not resume_text.strip():
+            return ojsonify({'error': 'Could not extract text from resume file'}, 400)
+        
+        # Parse resume
+        parsed_resume = resume_parser.parse_resume(resume_text)
+        
+        # Parse job description
+        job_requirements = job_matcher.extract_job_requirements(job_description)
+        
+        # Cheap skills keyword score, shared by embedding and scoring
+        skills_keyword_score = job_matcher.keyword_similarity(
+            parsed_resume['skills'], 
+            job_requirements['required_skills']
+        )
+        
+        # Embed all compared texts in a single batch
+        embeddings = job_matcher.precompute_embeddings(parsed_resume, job_requirements, skills_keyword_score)
+        
+        # Calculate match scores
+        exp_score = job_matcher.calculate_experience_match(
+            parsed_resume['experience'], 
+            job_requirements['required_experience']
+        )
+        
+        skills_score = job_matcher.calculate_skills_match(
+            parsed_resume['skills'], 
+            job_requirements['required_skills'],
+            embeddings,
+            skills_keyword_score
+        )
+        
+        edu_score = job_matcher.calculate_education_match(
+            parsed_resume['education'], 
+            job_requirements['required_education'],
+            embeddings
+        )
+        
+        overall_score = job_matcher.calculate_overall_score(exp_score, skills_score, edu_score)
+        
+        # Prepare response
+        result = {
+            'candidate_name': parsed_resume['name'],
+            'job_title': job_requirements['title'],
+            'match_scores': {
+                'experience_match': int(exp_score),
+                'skills_match': int(skills_score),
+                'education_match': int(edu_score),
+                'overall_score': int(overall_score)
+            },
+            'details': {
+                'parsed_resume': parsed_resume,
+                'job_requirements': job_requirements,
+                'semantic_matching_used': bool(embeddings)
+            }
+        }
+        
+        # Return JSON if requested via API, otherwise render HTML
+        if request.headers.get('Content-Type') == 'application/json' or 'application/json' in request.headers.get('Accept', ''):
+            return ojsonify(result)
+        else:
+            return render_result_page(result)
+    
+    except Exception as e:
+        return ojsonify({'error': f'An error occurred: {str(e)}'}, 500)
+
+def render_result_page(result):
+    """Render results page with detailed breakdown"""
+    return RESULT_TEMPLATE.render(result=result)
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return ojsonify({
         'status': 'healthy',
         'semantic_matching': SEMANTIC_MATCHING,
+        'semantic_model_loaded': _semantic_model is not None,
         'version': '1.0.0'
     })
 
 if __name__ == '__main__':
     print(f"Job Recommendation Score System")
     print(f"Semantic matching: {'Enabled' if SEMANTIC_MATCHING else 'Disabled'}")
-    print(f"Starting server on http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    print(f"Starting development server on http://localhost:5000")
+    print(f"For production use: gunicorn -c gunicorn_conf.py app:app")
+    app.run(host='0.0.0.0', port=5000)
 
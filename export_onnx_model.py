@@ -0,0 +1,51 @@
+"""Export all-MiniLM-L6-v2 to ONNX with dynamic int8 quantization.
+
+Run once before starting the server (requires optimum[onnxruntime]):
+
+    python export_onnx_model.py
+
+app.py only loads an already exported model from ONNX_MODEL_DIR and falls back
+to sentence-transformers when none is present.
+"""
+import os
+import shutil
+import tempfile
+
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+SEMANTIC_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR', 'onnx_model')
+
+def export_model(model_name, model_dir):
+    """Export and quantize the model, then move it into model_dir in one rename"""
+    parent_dir = os.path.dirname(os.path.abspath(model_dir))
+    os.makedirs(parent_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix='.onnx_export_', dir=parent_dir)
+    
+    try:
+        export_dir = os.path.join(build_dir, 'export')
+        quantized_dir = os.path.join(build_dir, 'quantized')
+        
+        model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+        model.save_pretrained(export_dir)
+        
+        # Dynamic int8 quantization targeting VNNI dot-product instructions
+        quantizer = ORTQuantizer.from_pretrained(export_dir)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+        model.config.save_pretrained(quantized_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(quantized_dir)
+        
+        # Swap the finished model into place so the app never sees a partial export
+        if os.path.exists(model_dir):
+            os.replace(model_dir, os.path.join(build_dir, 'previous'))
+        os.replace(quantized_dir, model_dir)
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    print(f"Exporting {SEMANTIC_MODEL_NAME} to {ONNX_MODEL_DIR}")
+    export_model(SEMANTIC_MODEL_NAME, ONNX_MODEL_DIR)
+    print("Done")
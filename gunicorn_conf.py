@@ -0,0 +1,7 @@
+import os
+
+# Gunicorn settings for serving the Flask app: gunicorn -c gunicorn_conf.py app:app
+bind = '0.0.0.0:5000'
+workers = max(1, (os.cpu_count() or 2) // 2)
+threads = 2
+timeout = 120